@@ -9,6 +9,7 @@ import (
 	"os/signal"
 	"syscall"
 	"time"
+	"unicode/utf8"
 
 	"github.com/gin-gonic/gin"
 	"github.com/jmoiron/sqlx"
@@ -226,6 +227,31 @@ func main() {
 			})
 		})
 
+		tools.POST("/embed", func(c *gin.Context) {
+			var req models.EmbedTextRequest
+			if err := c.ShouldBindJSON(&req); err != nil {
+				c.JSON(http.StatusBadRequest, gin.H{"error": err.Error()})
+				return
+			}
+
+			if req.Text == "" {
+				c.JSON(http.StatusBadRequest, gin.H{"error": "text must not be empty"})
+				return
+			}
+			if utf8.RuneCountInString(req.Text) > 2000 {
+				c.JSON(http.StatusBadRequest, gin.H{"error": "text must be at most 2000 characters"})
+				return
+			}
+
+			embedding, err := embeddingService.GenerateEmbedding(c.Request.Context(), req.Text)
+			if err != nil {
+				c.JSON(http.StatusInternalServerError, gin.H{"error": err.Error()})
+				return
+			}
+
+			c.JSON(http.StatusOK, models.EmbedTextResponse{Embedding: embedding})
+		})
+
 		tools.POST("/save-message", func(c *gin.Context) {
 			var req models.SaveMessageRequest
 			if err := c.ShouldBindJSON(&req); err != nil {
@@ -249,12 +275,21 @@ func main() {
 
 			c.JSON(http.StatusCreated, models.SaveMessageResponse{Message: *msg})
 		})
+
+		tools.POST("/save-messages", convHandler.SaveMessages)
 	}
 
+	// Serve HTTP/1.1 and cleartext HTTP/2 (h2c, prior knowledge) so the
+	// Python agent can multiplex concurrent tool calls over one connection
+	protocols := new(http.Protocols)
+	protocols.SetHTTP1(true)
+	protocols.SetUnencryptedHTTP2(true)
+
 	// Create HTTP server
 	srv := &http.Server{
-		Addr:    fmt.Sprintf("%s:%d", cfg.Server.Host, cfg.Server.Port),
-		Handler: router,
+		Addr:      fmt.Sprintf("%s:%d", cfg.Server.Host, cfg.Server.Port),
+		Handler:   router,
+		Protocols: protocols,
 	}
 
 	// Start server in goroutine
@@ -1,6 +1,7 @@
 package handlers
 
 import (
+	"fmt"
 	"net/http"
 
 	"github.com/gin-gonic/gin"
@@ -9,6 +10,18 @@ import (
 	"smart-company-discovery/internal/service"
 )
 
+// maxSaveMessagesBatch caps a bulk save well below Postgres' limit of
+// 65535 bind parameters per statement (6 per inserted row)
+const maxSaveMessagesBatch = 500
+
+// validMessageRoles mirrors the CHECK constraint on messages.role
+var validMessageRoles = map[string]bool{
+	"user":      true,
+	"assistant": true,
+	"tool":      true,
+	"system":    true,
+}
+
 type ConversationHandler struct {
 	convService service.ConversationService
 }
@@ -116,6 +129,42 @@ func (h *ConversationHandler) AddMessage(c *gin.Context) {
 	c.JSON(http.StatusCreated, models.CreateMessageResponse{Message: *msg})
 }
 
+// SaveMessages handles saving several messages to a conversation in one request
+func (h *ConversationHandler) SaveMessages(c *gin.Context) {
+	var req models.SaveMessagesRequest
+	if err := c.ShouldBindJSON(&req); err != nil {
+		c.JSON(http.StatusBadRequest, gin.H{"error": err.Error()})
+		return
+	}
+
+	if len(req.Messages) == 0 {
+		c.JSON(http.StatusBadRequest, gin.H{"error": "messages must not be empty"})
+		return
+	}
+	if len(req.Messages) > maxSaveMessagesBatch {
+		c.JSON(http.StatusBadRequest, gin.H{"error": fmt.Sprintf("at most %d messages can be saved at once", maxSaveMessagesBatch)})
+		return
+	}
+	for i, msg := range req.Messages {
+		if !validMessageRoles[msg.Role] {
+			c.JSON(http.StatusBadRequest, gin.H{"error": fmt.Sprintf("messages[%d]: invalid role %q", i, msg.Role)})
+			return
+		}
+		if msg.RawMessage == nil {
+			c.JSON(http.StatusBadRequest, gin.H{"error": fmt.Sprintf("messages[%d]: raw_message is required", i)})
+			return
+		}
+	}
+
+	msgs, err := h.convService.AddMessages(c.Request.Context(), req.ConversationID, req.Messages)
+	if err != nil {
+		c.JSON(http.StatusInternalServerError, gin.H{"error": err.Error()})
+		return
+	}
+
+	c.JSON(http.StatusCreated, models.SaveMessagesResponse{Messages: convertMessagePointers(msgs)})
+}
+
 // GetMessages handles retrieving messages for a conversation
 func (h *ConversationHandler) GetMessages(c *gin.Context) {
 	idStr := c.Param("id")
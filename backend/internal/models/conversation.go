@@ -74,3 +74,22 @@ type SaveMessageRequest struct {
 type SaveMessageResponse struct {
 	Message Message `json:"message"`
 }
+
+// SaveMessageItem represents a single message within a bulk save request
+type SaveMessageItem struct {
+	Role       string                 `json:"role" validate:"required,oneof=user assistant tool system"`
+	Content    *string                `json:"content"`
+	ToolCallID *string                `json:"tool_call_id"`
+	RawMessage map[string]interface{} `json:"raw_message" validate:"required"`
+}
+
+// SaveMessagesRequest represents a request to save several messages from Python agent in one call
+type SaveMessagesRequest struct {
+	ConversationID uuid.UUID         `json:"conversation_id" validate:"required"`
+	Messages       []SaveMessageItem `json:"messages" validate:"required,min=1,dive"`
+}
+
+// SaveMessagesResponse represents the response after saving messages in bulk
+type SaveMessagesResponse struct {
+	Messages []Message `json:"messages"`
+}
@@ -120,3 +120,13 @@ type SemanticSearchResponse struct {
 	Results []SimilarityMatch `json:"results"`
 	Count   int               `json:"count"`
 }
+
+// EmbedTextRequest represents a request to embed text with the search embedding model
+type EmbedTextRequest struct {
+	Text string `json:"text" validate:"required,min=1,max=2000"`
+}
+
+// EmbedTextResponse represents the embedding of a text
+type EmbedTextResponse struct {
+	Embedding []float32 `json:"embedding"`
+}
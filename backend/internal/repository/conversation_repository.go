@@ -5,6 +5,8 @@ import (
 	"database/sql"
 	"encoding/json"
 	"fmt"
+	"strings"
+	"time"
 
 	"smart-company-discovery/internal/models"
 
@@ -19,6 +21,7 @@ type ConversationRepository interface {
 	ListConversations(ctx context.Context, params models.CursorParams) ([]*models.Conversation, *models.CursorPagination, error)
 	DeleteConversation(ctx context.Context, id uuid.UUID) error
 	CreateMessage(ctx context.Context, msg *models.Message) error
+	CreateMessages(ctx context.Context, msgs []*models.Message) error
 	GetMessages(ctx context.Context, conversationID uuid.UUID, params models.CursorParams) ([]*models.Message, *models.CursorPagination, error)
 }
 
@@ -192,6 +195,66 @@ func (r *conversationRepository) CreateMessage(ctx context.Context, msg *models.
 		msg.ID, msg.ConversationID, msg.Role, msg.Content, msg.ToolCallID, rawMessageJSON).Scan(&msg.CreatedAt)
 }
 
+// CreateMessages creates several messages with a single multi-row INSERT.
+// Rows get strictly increasing created_at values so they keep their order
+// when read back.
+func (r *conversationRepository) CreateMessages(ctx context.Context, msgs []*models.Message) error {
+	if len(msgs) == 0 {
+		return nil
+	}
+
+	values := make([]string, len(msgs))
+	args := make([]interface{}, 0, len(msgs)*6)
+	for i, msg := range msgs {
+		if msg.ID == uuid.Nil {
+			id, err := uuid.NewV7()
+			if err != nil {
+				return fmt.Errorf("failed to generate UUID: %w", err)
+			}
+			msg.ID = id
+		}
+
+		rawMessageJSON, err := json.Marshal(msg.RawMessage)
+		if err != nil {
+			return fmt.Errorf("failed to marshal raw_message: %w", err)
+		}
+
+		n := i * 6
+		values[i] = fmt.Sprintf("($%d, $%d, $%d, $%d, $%d, $%d, NOW() + interval '%d microseconds')",
+			n+1, n+2, n+3, n+4, n+5, n+6, i)
+		args = append(args, msg.ID, msg.ConversationID, msg.Role, msg.Content, msg.ToolCallID, rawMessageJSON)
+	}
+
+	query := fmt.Sprintf(`
+		INSERT INTO messages (id, conversation_id, role, content, tool_call_id, raw_message, created_at)
+		VALUES %s
+		RETURNING id, created_at
+	`, strings.Join(values, ", "))
+
+	rows, err := r.db.QueryContext(ctx, query, args...)
+	if err != nil {
+		return err
+	}
+	defer rows.Close()
+
+	byID := make(map[uuid.UUID]*models.Message, len(msgs))
+	for _, msg := range msgs {
+		byID[msg.ID] = msg
+	}
+	for rows.Next() {
+		var id uuid.UUID
+		var createdAt time.Time
+		if err := rows.Scan(&id, &createdAt); err != nil {
+			return err
+		}
+		if msg, ok := byID[id]; ok {
+			msg.CreatedAt = createdAt
+		}
+	}
+
+	return rows.Err()
+}
+
 // GetMessages retrieves messages for a conversation
 func (r *conversationRepository) GetMessages(ctx context.Context, conversationID uuid.UUID, params models.CursorParams) ([]*models.Message, *models.CursorPagination, error) {
 	if params.Limit < 1 {
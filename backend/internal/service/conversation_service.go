@@ -16,6 +16,7 @@ type ConversationService interface {
 	ListConversations(ctx context.Context, params models.CursorParams) ([]*models.Conversation, *models.CursorPagination, error)
 	DeleteConversation(ctx context.Context, id uuid.UUID) error
 	AddMessage(ctx context.Context, req models.CreateMessageRequest) (*models.Message, error)
+	AddMessages(ctx context.Context, conversationID uuid.UUID, items []models.SaveMessageItem) ([]*models.Message, error)
 	GetMessages(ctx context.Context, conversationID uuid.UUID, params models.CursorParams) ([]*models.Message, *models.CursorPagination, error)
 }
 
@@ -94,6 +95,35 @@ func (s *conversationService) AddMessage(ctx context.Context, req models.CreateM
 	return msg, nil
 }
 
+// AddMessages adds several messages to a conversation in one round-trip
+func (s *conversationService) AddMessages(ctx context.Context, conversationID uuid.UUID, items []models.SaveMessageItem) ([]*models.Message, error) {
+	conv, err := s.convRepo.GetConversation(ctx, conversationID)
+	if err != nil {
+		return nil, fmt.Errorf("failed to get conversation: %w", err)
+	}
+	if conv == nil {
+		return nil, fmt.Errorf("conversation not found")
+	}
+
+	msgs := make([]*models.Message, len(items))
+	for i, item := range items {
+		msgs[i] = &models.Message{
+			ConversationID: conversationID,
+			Role:           item.Role,
+			Content:        item.Content,
+			ToolCallID:     item.ToolCallID,
+			RawMessage:     item.RawMessage,
+		}
+	}
+
+	err = s.convRepo.CreateMessages(ctx, msgs)
+	if err != nil {
+		return nil, fmt.Errorf("failed to create messages: %w", err)
+	}
+
+	return msgs, nil
+}
+
 // GetMessages retrieves messages for a conversation
 func (s *conversationService) GetMessages(ctx context.Context, conversationID uuid.UUID, params models.CursorParams) ([]*models.Message, *models.CursorPagination, error) {
 	return s.convRepo.GetMessages(ctx, conversationID, params)
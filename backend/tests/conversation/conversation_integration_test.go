@@ -12,6 +12,7 @@ import (
 	"testing"
 
 	"github.com/gin-gonic/gin"
+	"github.com/google/uuid"
 	"github.com/stretchr/testify/assert"
 	"github.com/stretchr/testify/require"
 
@@ -48,6 +49,11 @@ func setupTestRouter(t *testing.T) (*gin.Engine, func()) {
 		api.GET("/conversations/:id/messages", convHandler.GetMessages)
 	}
 
+	tools := router.Group("/tools")
+	{
+		tools.POST("/save-messages", convHandler.SaveMessages)
+	}
+
 	// Cleanup function
 	cleanup := func() {
 		db.Close() // Triggers automatic rollback
@@ -363,6 +369,201 @@ func TestConversationHandler_GetMessages(t *testing.T) {
 	})
 }
 
+func TestConversationHandler_SaveMessages(t *testing.T) {
+	router, cleanup := setupTestRouter(t)
+	defer cleanup()
+
+	// Create conversation
+	createReq := models.CreateConversationRequest{Title: "Bulk Save Test"}
+	createBody, _ := json.Marshal(createReq)
+	req := httptest.NewRequest(http.MethodPost, "/api/conversations", bytes.NewBuffer(createBody))
+	req.Header.Set("Content-Type", "application/json")
+	w := httptest.NewRecorder()
+	router.ServeHTTP(w, req)
+
+	var createResp models.CreateConversationResponse
+	json.Unmarshal(w.Body.Bytes(), &createResp)
+	convID := createResp.Conversation.ID
+
+	saveMessages := func(body interface{}) *httptest.ResponseRecorder {
+		bodyBytes, err := json.Marshal(body)
+		require.NoError(t, err)
+		req := httptest.NewRequest(http.MethodPost, "/tools/save-messages", bytes.NewBuffer(bodyBytes))
+		req.Header.Set("Content-Type", "application/json")
+		w := httptest.NewRecorder()
+		router.ServeHTTP(w, req)
+		return w
+	}
+
+	t.Run("saves a turn and reads it back in order", func(t *testing.T) {
+		turn := models.SaveMessagesRequest{
+			ConversationID: convID,
+			Messages: []models.SaveMessageItem{
+				{
+					Role:    "user",
+					Content: stringPtr("What is the refund policy?"),
+					RawMessage: map[string]interface{}{
+						"role":    "user",
+						"content": "What is the refund policy?",
+					},
+				},
+				{
+					Role:    "assistant",
+					Content: stringPtr(""),
+					RawMessage: map[string]interface{}{
+						"role":    "assistant",
+						"content": "",
+						"tool_calls": []interface{}{
+							map[string]interface{}{
+								"id":   "call_refund",
+								"type": "function",
+								"function": map[string]interface{}{
+									"name":      "search_both",
+									"arguments": "{\"query\":\"refund policy\"}",
+								},
+							},
+						},
+					},
+				},
+				{
+					Role:       "tool",
+					Content:    stringPtr("Result 1: ..."),
+					ToolCallID: stringPtr("call_refund"),
+					RawMessage: map[string]interface{}{
+						"role":         "tool",
+						"content":      "Result 1: ...",
+						"tool_call_id": "call_refund",
+					},
+				},
+				{
+					Role:    "assistant",
+					Content: stringPtr("Refunds are issued within 30 days."),
+					RawMessage: map[string]interface{}{
+						"role":    "assistant",
+						"content": "Refunds are issued within 30 days.",
+					},
+				},
+			},
+		}
+
+		w := saveMessages(turn)
+		require.Equal(t, http.StatusCreated, w.Code)
+
+		var saveResp models.SaveMessagesResponse
+		require.NoError(t, json.Unmarshal(w.Body.Bytes(), &saveResp))
+		require.Len(t, saveResp.Messages, len(turn.Messages))
+		for i, msg := range saveResp.Messages {
+			assert.NotEmpty(t, msg.ID)
+			assert.Equal(t, convID, msg.ConversationID)
+			assert.Equal(t, turn.Messages[i].Role, msg.Role)
+			assert.False(t, msg.CreatedAt.IsZero())
+		}
+
+		url := fmt.Sprintf("/api/conversations/%s/messages", convID.String())
+		req := httptest.NewRequest(http.MethodGet, url, nil)
+		w = httptest.NewRecorder()
+		router.ServeHTTP(w, req)
+		require.Equal(t, http.StatusOK, w.Code)
+
+		var listResp models.ListMessagesResponse
+		require.NoError(t, json.Unmarshal(w.Body.Bytes(), &listResp))
+		require.Len(t, listResp.Data, len(turn.Messages))
+
+		// Rows saved in one request come back in the order they were sent
+		for i, msg := range listResp.Data {
+			assert.Equal(t, saveResp.Messages[i].ID, msg.ID)
+			assert.Equal(t, turn.Messages[i].Role, msg.Role)
+		}
+		assert.Equal(t, "call_refund", *listResp.Data[2].ToolCallID)
+		assert.Equal(t, "Refunds are issued within 30 days.", *listResp.Data[3].Content)
+	})
+
+	t.Run("empty messages list", func(t *testing.T) {
+		w := saveMessages(models.SaveMessagesRequest{
+			ConversationID: convID,
+			Messages:       []models.SaveMessageItem{},
+		})
+		assert.Equal(t, http.StatusBadRequest, w.Code)
+
+		var body map[string]interface{}
+		require.NoError(t, json.Unmarshal(w.Body.Bytes(), &body))
+		assert.Contains(t, body["error"], "messages must not be empty")
+	})
+
+	t.Run("invalid role", func(t *testing.T) {
+		w := saveMessages(models.SaveMessagesRequest{
+			ConversationID: convID,
+			Messages: []models.SaveMessageItem{
+				{
+					Role:       "robot",
+					Content:    stringPtr("Test"),
+					RawMessage: map[string]interface{}{"role": "robot", "content": "Test"},
+				},
+			},
+		})
+		assert.Equal(t, http.StatusBadRequest, w.Code)
+
+		var body map[string]interface{}
+		require.NoError(t, json.Unmarshal(w.Body.Bytes(), &body))
+		assert.Contains(t, body["error"], "invalid role")
+	})
+
+	t.Run("missing raw_message", func(t *testing.T) {
+		w := saveMessages(models.SaveMessagesRequest{
+			ConversationID: convID,
+			Messages: []models.SaveMessageItem{
+				{Role: "user", Content: stringPtr("Test")},
+			},
+		})
+		assert.Equal(t, http.StatusBadRequest, w.Code)
+
+		var body map[string]interface{}
+		require.NoError(t, json.Unmarshal(w.Body.Bytes(), &body))
+		assert.Contains(t, body["error"], "raw_message is required")
+	})
+
+	t.Run("too many messages", func(t *testing.T) {
+		messages := make([]models.SaveMessageItem, 501)
+		for i := range messages {
+			messages[i] = models.SaveMessageItem{
+				Role:       "user",
+				Content:    stringPtr("Test"),
+				RawMessage: map[string]interface{}{"role": "user", "content": "Test"},
+			}
+		}
+		w := saveMessages(models.SaveMessagesRequest{
+			ConversationID: convID,
+			Messages:       messages,
+		})
+		assert.Equal(t, http.StatusBadRequest, w.Code)
+
+		var body map[string]interface{}
+		require.NoError(t, json.Unmarshal(w.Body.Bytes(), &body))
+		assert.Contains(t, body["error"], "at most 500 messages")
+	})
+
+	t.Run("non-existent conversation", func(t *testing.T) {
+		w := saveMessages(models.SaveMessagesRequest{
+			ConversationID: uuid.MustParse("00000000-0000-0000-0000-000000000000"),
+			Messages: []models.SaveMessageItem{
+				{
+					Role:    "user",
+					Content: stringPtr("Test"),
+					RawMessage: map[string]interface{}{
+						"role":    "user",
+						"content": "Test",
+					},
+				},
+			},
+		})
+		assert.Equal(t, http.StatusInternalServerError, w.Code)
+
+		var body map[string]interface{}
+		require.NoError(t, json.Unmarshal(w.Body.Bytes(), &body))
+		assert.Contains(t, body["error"], "conversation not found")
+	})
+}
+
 func TestConversationHandler_MessagePagination(t *testing.T) {
 	router, cleanup := setupTestRouter(t)
 	defer cleanup()
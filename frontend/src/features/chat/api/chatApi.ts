@@ -77,11 +77,10 @@ export const chatApi = createApi({
 
 // Streaming event types from Python agent
 export interface StreamEvent {
-  type: 'langchain_event' | 'error'
+  type: 'langchain_event' | 'tool_status' | 'error'
   data: {
     // For langchain_event
     event?: string
-    name?: string
     data?: {
       chunk?: {
         content?: string
@@ -91,13 +90,12 @@ export interface StreamEvent {
           args: Record<string, unknown>
         }>
       }
-      input?: Record<string, unknown>
-      output?: {
-        tool_call_id?: string
-        name?: string
-        content?: string
-      }
     }
+    // For tool_status
+    phase?: 'start' | 'end'
+    name?: string
+    args?: Record<string, unknown>
+    tool_call_id?: string
     // For error
     message?: string
   }
@@ -125,19 +125,18 @@ export function ChatPage() {
               })))
             }
           }
-          
-          // Tool result arrived - match by tool_call_id
-          else if (event.data.event === 'on_tool_end') {
-            const toolMessage = event.data.data?.output
-            if (toolMessage?.tool_call_id) {
-              setStreamingToolCalls(prev =>
-                prev.map(tc =>
-                  tc.id === toolMessage.tool_call_id
-                    ? { ...tc, status: 'complete' as const }
-                    : tc
-                )
+        }
+        // Tool finished - match by tool_call_id
+        else if (event.type === 'tool_status') {
+          const toolCallId = event.data.tool_call_id
+          if (event.data.phase === 'end' && toolCallId) {
+            setStreamingToolCalls(prev =>
+              prev.map(tc =>
+                tc.id === toolCallId
+                  ? { ...tc, status: 'complete' as const }
+                  : tc
               )
-            }
+            )
           }
         }
         else if (event.type === 'error') {
@@ -1,318 +1,710 @@
 """LangChain agent with Gemini 2.5 Pro and conversation persistence."""
+import asyncio
+import logging
+import orjson
+from cachetools import TTLCache
+from contextlib import aclosing, asynccontextmanager
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.prebuilt import create_react_agent
 from uuid import UUID
-from typing import Optional, AsyncGenerator
+from typing import Optional, AsyncGenerator, AsyncIterator
 from agent.config import settings
 from agent.tools import tools
-from agent.client import BackendClient
-from agent.models import Message
+from agent.client import backend_client
+from agent.cache import SemanticResponseCache, configure_llm_cache
+from agent.models import StoredRawMessage
+
+logger = logging.getLogger(__name__)
+
+# Must be installed before any LLM call; identical prompts skip Gemini
+configure_llm_cache(settings.llm_cache, settings.redis_url, settings.llm_cache_size)
+
+# Pre-encoded pieces of the streamed event envelopes; only the variable
+# parts are serialized per event
+_STREAM_PREFIX = b'{"type":"langchain_event","data":{"event":"on_chat_model_stream","data":{"chunk":{"content":'
+_STREAM_MID = b',"tool_calls":'
+_STREAM_SUFFIX = b'}}}}'
+# Tool progress is reported as compact status events; tool output is not
+# streamed because clients refetch the stored messages after the turn
+_TOOL_START_PREFIX = b'{"type":"tool_status","data":{"phase":"start","name":'
+_TOOL_START_MID = b',"args":'
+_TOOL_END_PREFIX = b'{"type":"tool_status","data":{"phase":"end","name":'
+_TOOL_END_MID = b',"tool_call_id":'
+_TOOL_STATUS_SUFFIX = b'}}'
 
 # System prompt for the AI agent
-SYSTEM_PROMPT = """You are a specialized AI assistant for a company's Q&A knowledge base system.
-
-⚠️ CRITICAL RULES - YOU MUST FOLLOW THESE:
-
-1. **ALWAYS USE BOTH SEARCH METHODS** - You MUST call BOTH semantic_search_knowledge_base AND search_knowledge_base for EVERY question
-2. **NEVER answer from general knowledge** - Only provide information found in the knowledge base
-3. **ALWAYS search before responding** - Even if the question seems simple, search the knowledge base with both methods
-4. **If no results found** - Clearly state "I searched the knowledge base using both semantic and text search and found no information about [topic]"
-5. **Multiple searches allowed** - Try variations with both search types if needed
-6. **Be thorough** - Use both search methods to ensure comprehensive coverage
-
-🔧 AVAILABLE TOOLS:
-- semantic_search_knowledge_base: AI-powered semantic search - finds conceptually related content (ALWAYS USE THIS!)
-- search_knowledge_base: Full-text keyword search for Q&A pairs (ALWAYS USE THIS TOO!)
-- get_qa_by_ids: Get specific Q&A pairs by ID
-- list_knowledge_base_topics: List all available topics in the knowledge base
-
-📋 YOUR WORKFLOW FOR EVERY QUESTION:
-1. **STEP 1**: Call semantic_search_knowledge_base with the user's question (AI-powered understanding!)
-2. **STEP 2**: Call search_knowledge_base with relevant keywords (ensures exact matches aren't missed!)
-3. **STEP 3**: Review all search results from BOTH methods carefully (semantic shows similarity scores)
-4. **STEP 4**: Combine and deduplicate results from both searches
-5. **STEP 5**: Synthesize the information from the knowledge base
-6. **STEP 6**: Format response clearly with source attribution
-
-🎯 WHY USE BOTH METHODS:
-- **Semantic search** finds conceptually similar content even with different wording
-- **Text search** finds exact keyword matches that semantic might miss
-- **Using BOTH** maximizes recall and ensures comprehensive results
-- **Belt and suspenders approach** - don't rely on just one method!
-
-❌ WHAT NOT TO DO:
-- DO NOT answer questions without using BOTH search methods first
-- DO NOT use your training data or general knowledge
-- DO NOT say "I don't have access to that information" without trying BOTH searches
-- DO NOT give up after one search type - ALWAYS use both!
-- DO NOT skip text search if semantic finds results - ALWAYS use both!
-
-✅ EXAMPLE GOOD BEHAVIOR:
-User: "What is Docker?"
-You: *calls semantic_search_knowledge_base("What is Docker?")*
-You: *calls search_knowledge_base("Docker")*
-You: *reviews results from both methods and answers based ONLY on what was found*
-
-❌ EXAMPLE BAD BEHAVIOR:
-User: "What is Docker?"
-You: *calls semantic_search_knowledge_base("What is Docker?")*
-You: *answers immediately without also calling search_knowledge_base*
-
-🎯 YOUR MISSION:
-Help users by finding and presenting information from the company knowledge base. ALWAYS use both semantic and text search methods to ensure maximum coverage. Be persistent in your searches. Try multiple search strategies if needed. Always cite the knowledge base as your source."""
+SYSTEM_PROMPT = """You are an assistant for a company's Q&A knowledge base. Answer ONLY from the knowledge base, never from general knowledge.
+
+Tools:
+- search_both: semantic AND keyword search in one call, merged results
+- semantic_search_knowledge_base: semantic search only, with similarity scores
+- search_knowledge_base: full-text keyword search only
+- get_qa_by_ids: fetch Q&A pairs by ID
+- list_knowledge_base_topics: list available topics
+
+Rules:
+1. For every question, call search_both once before answering. Use the single-method search tools only to retry with rephrased queries.
+2. If the results report a HIGH-CONFIDENCE MATCH, answer from them right away without further searches.
+3. Combine and deduplicate the results, answer from them only and cite the knowledge base as the source.
+4. If nothing relevant is found, say: "I searched the knowledge base using both semantic and text search and found no information about [topic]"."""
+
+# Sent instead of SYSTEM_PROMPT once a conversation has prior turns; the
+# model already followed the full workflow there
+REMINDER_PROMPT = """Remember: call search_both before answering, answer ONLY from the knowledge base and cite it as your source.
+If nothing relevant is found, say so instead of using general knowledge."""
+
+# Instructions for condensing turns that fall outside the history window
+SUMMARY_PROMPT = """Summarize the earlier part of a conversation between a user and a knowledge base assistant.
+Preserve the user's questions, the knowledge base findings (including Q&A IDs) and the answers given. Be concise."""
+
+
+def _build_user(raw: StoredRawMessage, completed_tool_call_ids: set) -> HumanMessage:
+    return HumanMessage(content=raw.content or "")
+
+
+def _build_assistant(raw: StoredRawMessage, completed_tool_call_ids: set) -> Optional[AIMessage]:
+    content = raw.content or ""
+    if not raw.tool_calls:
+        return AIMessage(content=content)
+    
+    # Convert OpenAI format to LangChain format, keeping only tool calls
+    # that have corresponding ToolMessages
+    # OpenAI: {"id": "...", "type": "function", "function": {"name": "...", "arguments": "..."}}
+    # LangChain: {"name": "...", "args": {...}, "id": "..."}
+    langchain_tool_calls = [
+        {
+            "name": tc.function.name,
+            "args": orjson.loads(tc.function.arguments),
+            "id": tc.id
+        }
+        for tc in raw.tool_calls
+        if tc.id in completed_tool_call_ids
+    ]
+    if langchain_tool_calls:
+        return AIMessage(content=content, tool_calls=langchain_tool_calls)
+    if content:
+        # No valid tool calls but has content, keep as regular message
+        return AIMessage(content=content)
+    # Orphaned tool-calling message
+    return None
+
+
+def _build_tool(raw: StoredRawMessage, completed_tool_call_ids: set) -> ToolMessage:
+    tool_call_id = raw.tool_call_id or ""
+    if tool_call_id:
+        # Record the answered call for the assistant message that made it
+        completed_tool_call_ids.add(tool_call_id)
+    return ToolMessage(
+        content=raw.content or "",
+        tool_call_id=tool_call_id,
+        name=raw.name or "unknown"
+    )
+
+
+# Stored OpenAI-format message role -> LangChain message builder.
+# Builders return None for messages that must be dropped from history.
+_ROLE_BUILDERS = {
+    "user": _build_user,
+    "assistant": _build_assistant,
+    "tool": _build_tool,
+}
+
+
+def _to_openai_user(message: HumanMessage) -> dict:
+    return {"role": "user", "content": message.content}
+
+
+def _to_openai_assistant(message: AIMessage) -> dict:
+    if message.tool_calls:
+        return {
+            "role": "assistant",
+            "content": message.content or None,
+            "tool_calls": message.tool_calls
+        }
+    return {"role": "assistant", "content": message.content}
+
+
+def _to_openai_tool(message: ToolMessage) -> dict:
+    return {
+        "role": "tool",
+        "content": message.content,
+        "tool_call_id": message.tool_call_id
+    }
+
+
+def _to_openai_system(message) -> dict:
+    return {"role": "system", "content": str(message)}
+
+
+# LangChain message type -> OpenAI-format converter
+_OPENAI_CONVERTERS = {
+    HumanMessage: _to_openai_user,
+    AIMessage: _to_openai_assistant,
+    ToolMessage: _to_openai_tool,
+}
+
+
+def langchain_to_openai_format(message) -> dict:
+    """Convert LangChain message to OpenAI format."""
+    converter = _OPENAI_CONVERTERS.get(type(message))
+    if converter is None:
+        # Subclasses such as AIMessageChunk resolve through their MRO
+        converter = next(
+            (_OPENAI_CONVERTERS[cls] for cls in type(message).__mro__ if cls in _OPENAI_CONVERTERS),
+            _to_openai_system
+        )
+    return converter(message)
+
+
+def _window_start(history: list, window_turns: int) -> int:
+    """
+    Index where the last `window_turns` user turns start (1 = keep everything
+    after the leading system message).
+    Cuts only at user-message boundaries so assistant tool calls stay paired
+    with their tool results.
+    """
+    if window_turns <= 0:
+        return 1
+    turns = 0
+    for i in range(len(history) - 1, 0, -1):
+        if isinstance(history[i], HumanMessage):
+            turns += 1
+            if turns == window_turns:
+                return i
+    return 1
+
+
+def _format_transcript(messages: list) -> str:
+    """Render LangChain messages as plain text for the summarizer."""
+    lines = []
+    for message in messages:
+        if isinstance(message, ToolMessage):
+            lines.append(f"tool ({message.name}): {message.content}")
+        elif isinstance(message, AIMessage) and message.tool_calls:
+            calls = ", ".join(f"{tc['name']}({orjson.dumps(tc['args']).decode()})" for tc in message.tool_calls)
+            lines.append(f"assistant called: {calls}")
+        elif isinstance(message, HumanMessage):
+            lines.append(f"user: {message.content}")
+        elif message.content:
+            lines.append(f"assistant: {message.content}")
+    return "\n".join(lines)
 
 
 class ConversationalAgent:
     """LangChain agent with Gemini 2.5 Pro and conversation persistence."""
     
+    # Process-wide instance shared by all requests
+    _default: Optional["ConversationalAgent"] = None
+    
+    @classmethod
+    def get_default(cls) -> "ConversationalAgent":
+        """
+        Return the shared agent, creating it on first use.
+        Construction is synchronous, so no lock is needed on the event loop.
+        """
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+    
     def __init__(self):
         self.llm = ChatGoogleGenerativeAI(
             model=settings.gemini_model,
             google_api_key=settings.gemini_api_key,
             temperature=0.3,  # Lower temperature for more consistent tool usage
-            convert_system_message_to_human=True,
             max_retries=3,
         )
-        self.system_message = SystemMessage(content=SYSTEM_PROMPT)
+        # Cheap model that condenses turns outside the history window
+        self.summary_llm: Optional[ChatGoogleGenerativeAI] = None
+        if settings.history_summary_enabled:
+            self.summary_llm = ChatGoogleGenerativeAI(
+                model=settings.summary_model,
+                google_api_key=settings.gemini_api_key,
+                temperature=0,
+                max_retries=3,
+            )
+        # Immutable system messages, built once and shared by every history
+        self._full_system = SystemMessage(content=SYSTEM_PROMPT)
+        self._reminder_system = SystemMessage(content=REMINDER_PROMPT)
         # Note: state_modifier is not supported in newer langgraph versions
-        # The system message will be added directly in the chat method
+        # The system message leads every cached history and is sent to
+        # Gemini as a native system instruction
         self.agent = create_react_agent(
             self.llm, 
             tools
         )
-        self.backend_client = BackendClient()
+        self.backend_client = backend_client
+        # Message persistence runs in background tasks so saves never block
+        # the streaming path. Saves are chained per conversation: each waits
+        # for the conversation's previous save, so rows land in order while
+        # different conversations are written concurrently.
+        self._save_tails: dict[UUID, asyncio.Task] = {}
+        # Converted LangChain histories, extended locally after each turn so
+        # the backend is only read on a cache miss. Idle conversations expire
+        # after the TTL; the least recently used go first when full.
+        self._history_cache: TTLCache = TTLCache(
+            maxsize=settings.history_cache_size,
+            ttl=settings.history_cache_ttl
+        )
+        # conversation_id -> [lock, number of turns holding or awaiting it]
+        self._turn_locks: dict[UUID, list] = {}
+        # conversation_id -> (index of the first unsummarized message, summary)
+        self._summary_cache: TTLCache = TTLCache(
+            maxsize=settings.history_cache_size,
+            ttl=settings.history_cache_ttl
+        )
+        self.response_cache: Optional[SemanticResponseCache] = None
+        if settings.semantic_cache_enabled:
+            self.response_cache = SemanticResponseCache(
+                threshold=settings.semantic_cache_threshold,
+                max_size=settings.semantic_cache_size
+            )
+    
+    async def warmup(self) -> None:
+        """
+        Log the system prompt token counts so prompt regressions are visible.
+        The counts go through the async Gemini client that streams chat turns,
+        so its connection is opened here rather than on the first user message.
+        """
+        try:
+            full, reminder = await asyncio.gather(
+                self._count_tokens(SYSTEM_PROMPT),
+                self._count_tokens(REMINDER_PROMPT)
+            )
+            logger.info(f"📏 System prompt: {full} tokens (reminder: {reminder})")
+        except Exception as e:
+            logger.warning(f"Gemini warm-up failed, could not count system prompt tokens: {e}")
+    
+    async def _count_tokens(self, text: str) -> int:
+        """Count tokens with the model's async client (the streaming connection pool)."""
+        result = await self.llm.async_client.models.count_tokens(
+            model=self.llm.model,
+            contents=text
+        )
+        return result.total_tokens or 0
+    
+    def _flush_saves(
+        self,
+        conversation_id: UUID,
+        pending_saves: list[dict],
+        save_tasks: list[asyncio.Task]
+    ) -> None:
+        """
+        Start a bulk save of the buffered messages, after the conversation's
+        previous save. The task is added to save_tasks so the turn can check
+        its outcome.
+        """
+        if not pending_saves:
+            return
+        task = asyncio.create_task(self._save_batch(
+            self._save_tails.get(conversation_id), conversation_id, list(pending_saves)
+        ))
+        self._save_tails[conversation_id] = task
+        task.add_done_callback(
+            lambda done: self._on_save_done(conversation_id, done)
+        )
+        save_tasks.append(task)
+        pending_saves.clear()
+    
+    async def _save_batch(
+        self,
+        previous: Optional[asyncio.Task],
+        conversation_id: UUID,
+        messages: list[dict]
+    ) -> None:
+        """Write one batch once the conversation's previous batch has finished."""
+        if previous is not None:
+            # Ordering only: a failed batch is reported by its own turn
+            await asyncio.wait([previous])
+        try:
+            await self.backend_client.save_messages_bulk(conversation_id, messages)
+        except Exception as e:
+            logger.error(f"Failed to save messages: {e}", exc_info=True)
+            raise
+    
+    def _on_save_done(self, conversation_id: UUID, task: asyncio.Task) -> None:
+        """Drop the finished tail and mark its error as retrieved (it was logged)."""
+        if self._save_tails.get(conversation_id) is task:
+            del self._save_tails[conversation_id]
+        if not task.cancelled():
+            task.exception()
+    
+    async def _wait_for_saves(self, conversation_id: UUID) -> None:
+        """Wait until every save started so far for the conversation has finished."""
+        tail = self._save_tails.get(conversation_id)
+        if tail is not None:
+            await asyncio.wait([tail])
+    
+    async def aclose(self) -> None:
+        """Wait for in-flight message saves to finish."""
+        if self._save_tails:
+            await asyncio.wait(list(self._save_tails.values()))
+    
+    def _remember_history(self, conversation_id: UUID, history: list) -> None:
+        """Store a converted history; re-inserting restarts its TTL."""
+        self._history_cache[conversation_id] = history
+    
+    async def _finish_turn(
+        self,
+        conversation_id: UUID,
+        history: list,
+        turn_messages: list,
+        pending_saves: list[dict],
+        save_tasks: list[asyncio.Task]
+    ) -> None:
+        """
+        Persist the turn and put the extended history back in the cache.
+        Raises if any of the turn's saves failed; the history is then left
+        out of the cache so the next turn rebuilds it from the backend.
+        """
+        self._flush_saves(conversation_id, pending_saves, save_tasks)
+        # asyncio.wait never cancels the saves, even if the stream is
+        await asyncio.wait(save_tasks)
+        for task in save_tasks:
+            error = task.exception()
+            if error is not None:
+                raise RuntimeError(f"Failed to save messages: {error}") from error
+        history.extend(turn_messages)
+        self._remember_history(conversation_id, history)
     
     async def load_conversation_history(
         self, 
         conversation_id: UUID
     ) -> list:
-        """Load conversation history and convert to LangChain format."""
-        messages = await self.backend_client.get_messages(conversation_id)
+        """
+        Load conversation history and convert to LangChain format.
+        Served from the in-process cache when possible.
+        """
+        history = self._history_cache.get(conversation_id)
+        if history is not None:
+            return history
         
-        # First pass: collect all tool_call_ids that have responses
-        completed_tool_call_ids = set()
-        for msg in messages:
-            if msg.role == "tool":
-                tool_call_id = msg.raw_message.get("tool_call_id")
-                if tool_call_id:
-                    completed_tool_call_ids.add(tool_call_id)
+        # Callers hold the conversation's turn lock, so there is no
+        # concurrent fetch to deduplicate. Make sure queued saves for this
+        # conversation have landed first.
+        await self._wait_for_saves(conversation_id)
+        history = await self._fetch_conversation_history(conversation_id)
+        self._remember_history(conversation_id, history)
+        return history
+    
+    async def _fetch_conversation_history(self, conversation_id: UUID) -> list:
+        """Fetch conversation history from the backend and convert it."""
+        messages = await self.backend_client.get_stored_messages(conversation_id)
+        
+        # The system message is injected once here, so cached histories
+        # always start with it. Conversations with prior turns only get
+        # the compact reminder.
+        system_message = self._reminder_system if messages else self._full_system
+        langchain_messages: list = [system_message]
         
-        langchain_messages = []
+        # Single pass: tool builders record answered tool_call_ids, and
+        # tool-calling assistant messages get a placeholder that is filled
+        # in once every tool result has been seen
+        completed_tool_call_ids: set = set()
+        deferred: list[tuple[int, StoredRawMessage]] = []
         for msg in messages:
             raw = msg.raw_message
-            
-            if msg.role == "user":
-                langchain_messages.append(
-                    HumanMessage(content=raw.get("content", ""))
-                )
-            elif msg.role == "assistant":
-                if "tool_calls" in raw and raw["tool_calls"]:
-                    # Convert OpenAI format to LangChain format
-                    import json
-                    langchain_tool_calls = []
-                    for tc in raw["tool_calls"]:
-                        # Only include tool calls that have corresponding ToolMessages
-                        if tc["id"] in completed_tool_call_ids:
-                            # OpenAI: {"id": "...", "type": "function", "function": {"name": "...", "arguments": "..."}}
-                            # LangChain: {"name": "...", "args": {...}, "id": "..."}
-                            langchain_tool_calls.append({
-                                "name": tc["function"]["name"],
-                                "args": json.loads(tc["function"]["arguments"]),
-                                "id": tc["id"]
-                            })
-                    
-                    # Only add the AIMessage if it has valid tool calls or content
-                    if langchain_tool_calls:
-                        langchain_messages.append(
-                            AIMessage(
-                                content=raw.get("content") or "",
-                                tool_calls=langchain_tool_calls
-                            )
-                        )
-                    elif raw.get("content"):
-                        # If no valid tool calls but has content, add as regular message
-                        langchain_messages.append(
-                            AIMessage(content=raw.get("content", ""))
-                        )
-                    # Otherwise skip this orphaned tool-calling message
-                else:
-                    langchain_messages.append(
-                        AIMessage(content=raw.get("content", ""))
-                    )
-            elif msg.role == "tool":
-                langchain_messages.append(
-                    ToolMessage(
-                        content=raw.get("content", ""),
-                        tool_call_id=raw.get("tool_call_id", ""),
-                        name=raw.get("name", "unknown")
-                    )
-                )
+            role = msg.role
+            if role == "assistant" and raw.tool_calls:
+                deferred.append((len(langchain_messages), raw))
+                langchain_messages.append(None)
+                continue
+            builder = _ROLE_BUILDERS.get(role)
+            if builder is not None:
+                langchain_messages.append(builder(raw, completed_tool_call_ids))
+        
+        orphaned = False
+        for position, raw in deferred:
+            lc_message = _build_assistant(raw, completed_tool_call_ids)
+            langchain_messages[position] = lc_message
+            orphaned = orphaned or lc_message is None
+        if orphaned:
+            langchain_messages = [m for m in langchain_messages if m is not None]
         
         return langchain_messages
     
-    def langchain_to_openai_format(self, message) -> dict:
-        """Convert LangChain message to OpenAI format."""
-        if isinstance(message, HumanMessage):
-            return {"role": "user", "content": message.content}
-        elif isinstance(message, AIMessage):
-            if message.tool_calls:
-                return {
-                    "role": "assistant",
-                    "content": message.content or None,
-                    "tool_calls": message.tool_calls
-                }
-            return {"role": "assistant", "content": message.content}
-        elif isinstance(message, ToolMessage):
-            return {
-                "role": "tool",
-                "content": message.content,
-                "tool_call_id": message.tool_call_id
-            }
-        return {"role": "system", "content": str(message)}
+    async def _prompt_messages(self, conversation_id: UUID, history: list) -> list:
+        """
+        Build the messages sent to the LLM: the system message, a summary of
+        the turns outside the window and the recent turns verbatim.
+        The summary is only recomputed once another full window of turns has
+        aged out, so the prompt stays bounded at under two windows.
+        """
+        window_turns = settings.history_window_turns
+        start = _window_start(history, window_turns)
+        if start == 1:
+            return history
+        if self.summary_llm is None:
+            return history[:1] + history[start:]
+        
+        covered, summary = self._summary_cache.get(conversation_id, (1, ""))
+        if covered > start or not isinstance(history[covered], HumanMessage):
+            # History was rebuilt from the backend; start over
+            covered, summary = 1, ""
+        aged_out = sum(isinstance(m, HumanMessage) for m in history[covered:start])
+        if aged_out >= window_turns:
+            try:
+                response = await self.summary_llm.ainvoke([
+                    SystemMessage(content=SUMMARY_PROMPT),
+                    HumanMessage(
+                        content=f"Previous summary:\n{summary or '(none)'}\n\n"
+                        f"New messages:\n{_format_transcript(history[covered:start])}"
+                    )
+                ])
+                if isinstance(response.content, str) and response.content:
+                    covered, summary = start, response.content
+                    self._summary_cache[conversation_id] = (covered, summary)
+            except Exception as e:
+                logger.warning(f"History summary failed, keeping the previous one: {e}")
+        
+        if not summary:
+            return history[:1] + history[covered:]
+        return [
+            history[0],
+            SystemMessage(content=f"PRIOR_SUMMARY:\n{summary}"),
+            *history[covered:]
+        ]
+    
+    @asynccontextmanager
+    async def _turn_lock(self, conversation_id: UUID) -> AsyncIterator[None]:
+        """
+        Run one turn at a time per conversation. A turn takes the cached
+        history and puts it back extended, so overlapping turns (double
+        submit, two tabs) would otherwise overwrite each other's messages.
+        """
+        entry = self._turn_locks.get(conversation_id)
+        if entry is None:
+            entry = self._turn_locks[conversation_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._turn_locks[conversation_id]
     
     async def chat(
         self,
         conversation_id: UUID,
         user_message: str
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """
-        Process user message and stream agent response.
-        Saves all messages to backend.
+        Process user message and stream agent response as JSON-encoded bytes.
+        Saves all messages to backend in bulk in the background; the stream
+        only completes once this turn's messages are persisted, so clients
+        can refetch the conversation right after it ends. A failed save
+        raises, so the client gets an error event.
+        Turns on the same conversation run one after another.
         """
-        # Load history
+        async with self._turn_lock(conversation_id):
+            # aclosing: a disconnect finishes the turn before the lock is freed
+            async with aclosing(self._run_turn(conversation_id, user_message)) as events:
+                async for event in events:
+                    yield event
+    
+    async def _run_turn(
+        self,
+        conversation_id: UUID,
+        user_message: str
+    ) -> AsyncGenerator[bytes, None]:
+        """Run one turn of the conversation; see chat()."""
+        # Load history. The entry leaves the cache for the duration of the
+        # turn and is put back with this turn's messages once it completes,
+        # so an aborted turn forces a refetch instead of a stale history.
         history = await self.load_conversation_history(conversation_id)
+        self._history_cache.pop(conversation_id, None)
+        is_first_turn = len(history) == 1  # Only the system message
+        if not is_first_turn:
+            # The full prompt was already sent on the first turn
+            history[0] = self._reminder_system
         
-        # Add system message at the beginning if history is empty
-        if not history or not isinstance(history[0], SystemMessage):
-            history.insert(0, self.system_message)
+        # The turn's messages, the user message included, are buffered and
+        # persisted in bulk: once before the first tool runs (so the
+        # tool-calling assistant row is durable) and once when the turn
+        # ends, however it ends.
+        pending_saves: list[dict] = []
+        save_tasks: list[asyncio.Task] = []
+        flushed = False
         
         # Save user message
         user_msg_dict = {"role": "user", "content": user_message}
-        await self.backend_client.save_message(
-            conversation_id=conversation_id,
-            role="user",
-            content=user_message,
-            tool_call_id=None,
-            raw_message=user_msg_dict
-        )
+        pending_saves.append({
+            "role": "user",
+            "content": user_message,
+            "tool_call_id": None,
+            "raw_message": user_msg_dict
+        })
         
         # Add user message to history
         history.append(HumanMessage(content=user_message))
+        # Messages produced during this turn, appended to the cached history
+        turn_messages: list = []
         
-        # Stream agent response
-        import json
-        
-        async for event in self.agent.astream_events(
-            {"messages": history},
-            version="v1",
-            config=RunnableConfig(
-                recursion_limit=25,  # Allow more steps for thorough searching
-                configurable={"thread_id": str(conversation_id)}
-            )
-        ):
-            kind = event["event"]
-            
-            # Stream only essential LangChain events to frontend
-            if kind == "on_chat_model_stream":
-                chunk = event["data"]["chunk"]
-                # Serialize the chunk data
-                serializable_event = {
-                    "event": kind,
-                    "data": {
-                        "chunk": {
-                            "content": chunk.content if hasattr(chunk, "content") else "",
-                            "tool_calls": chunk.tool_calls if hasattr(chunk, "tool_calls") and chunk.tool_calls else []
-                        }
-                    }
-                }
-                yield json.dumps({
-                    "type": "langchain_event",
-                    "data": serializable_event
-                })
-            
-            elif kind == "on_tool_start":
-                # Already serializable
-                yield json.dumps({
-                    "type": "langchain_event",
-                    "data": {
-                        "event": kind,
-                        "name": event["name"],
-                        "data": event["data"]
-                    }
-                })
+        try:
+            # Standalone questions (first turn of a conversation) can be answered
+            # from the semantic response cache; follow-ups depend on context.
+            query_embedding = None
+            if is_first_turn and self.response_cache is not None:
+                try:
+                    query_embedding = await self.backend_client.embed_text(user_message)
+                except Exception as e:
+                    logger.warning(f"Skipping response cache, embedding failed: {e}")
+                cached_response = (
+                    self.response_cache.lookup(query_embedding)
+                    if query_embedding is not None else None
+                )
+                if cached_response is not None:
+                    yield _STREAM_PREFIX + orjson.dumps(cached_response) + _STREAM_MID + b"[]" + _STREAM_SUFFIX
+                    turn_messages.append(AIMessage(content=cached_response))
+                    pending_saves.append({
+                        "role": "assistant",
+                        "content": cached_response,
+                        "tool_call_id": None,
+                        "raw_message": {"role": "assistant", "content": cached_response}
+                    })
+                    await self._finish_turn(
+                        conversation_id, history, turn_messages, pending_saves, save_tasks
+                    )
+                    return
             
-            elif kind == "on_tool_end":
-                # Extract ToolMessage and make it serializable
-                tool_message = event["data"]["output"]
-                yield json.dumps({
-                    "type": "langchain_event",
-                    "data": {
-                        "event": kind,
-                        "name": event["name"],
-                        "data": {
-                            "output": {
-                                "tool_call_id": tool_message.tool_call_id,
-                                "name": tool_message.name,
-                                "content": tool_message.content
-                            }
-                        }
-                    }
-                })
+            final_response = ""
+            # Model runs that streamed at least one chunk. LLM-cache hits
+            # skip streaming and only emit on_chat_model_end.
+            streamed_runs: set = set()
             
-            # Save messages to DB in OpenAI format
-            if kind == "on_chat_model_end":
-                # Extract the complete AIMessage
-                ai_message = event["data"]["output"]["generations"][0][0]["message"]
-                
-                # Convert to OpenAI format with LLM's native tool_call IDs
-                openai_msg = {
-                    "role": "assistant",
-                    "content": ai_message.content or "",
-                }
+            # Stream agent response
+            async for event in self.agent.astream_events(
+                {"messages": await self._prompt_messages(conversation_id, history)},
+                version="v2",
+                # Prune chain/graph events at the source; only these are handled
+                include_types=["chat_model", "tool"],
+                config=RunnableConfig(
+                    recursion_limit=25,  # Allow more steps for thorough searching
+                    configurable={"thread_id": str(conversation_id)}
+                )
+            ):
+                kind = event["event"]
                 
-                # Add tool_calls if present (uses LLM's UUIDs)
-                if hasattr(ai_message, "tool_calls") and ai_message.tool_calls:
-                    openai_msg["tool_calls"] = [
-                        {
-                            "id": tc["id"],
-                            "type": "function",
-                            "function": {
-                                "name": tc["name"],
-                                "arguments": json.dumps(tc["args"])
-                            }
-                        }
-                        for tc in ai_message.tool_calls
-                    ]
+                # Stream only essential LangChain events to frontend
+                if kind == "on_chat_model_stream":
+                    chunk = event["data"]["chunk"]
+                    content = getattr(chunk, "content", None)
+                    tool_calls = getattr(chunk, "tool_calls", None)
+                    # Skip the empty deltas emitted between tool phases; chunks
+                    # announcing tool calls are kept for the frontend
+                    if not content and not tool_calls:
+                        continue
+                    streamed_runs.add(event["run_id"])
+                    yield (
+                        _STREAM_PREFIX + orjson.dumps(content or "")
+                        + _STREAM_MID + orjson.dumps(tool_calls or [])
+                        + _STREAM_SUFFIX
+                    )
+                    continue
                 
-                # Save to database
-                await self.backend_client.save_message(
-                    conversation_id=conversation_id,
-                    role="assistant",
-                    content=openai_msg.get("content"),
-                    tool_call_id=None,
-                    raw_message=openai_msg
-                )
-            
-            elif kind == "on_tool_end":
-                # Extract the ToolMessage
-                tool_message = event["data"]["output"]
+                data = event["data"]
+                if kind == "on_tool_start":
+                    if not flushed:
+                        self._flush_saves(conversation_id, pending_saves, save_tasks)
+                        flushed = True
+                    # Tool input is already serializable
+                    yield (
+                        _TOOL_START_PREFIX + orjson.dumps(event["name"])
+                        + _TOOL_START_MID + orjson.dumps(data.get("input"))
+                        + _TOOL_STATUS_SUFFIX
+                    )
                 
-                # Convert to OpenAI format with LLM's native tool_call ID
-                openai_msg = {
-                    "role": "tool",
-                    "tool_call_id": tool_message.tool_call_id,
-                    "name": tool_message.name,
-                    "content": tool_message.content
-                }
+                elif kind == "on_tool_end":
+                    # Extract the ToolMessage once; the same fields feed the
+                    # status event, the stored OpenAI message and the history
+                    tool_message = data["output"]
+                    content = tool_message.content
+                    tool_call_id = tool_message.tool_call_id
+                    tool_output = {
+                        "tool_call_id": tool_call_id,
+                        "name": tool_message.name,
+                        "content": content
+                    }
+                    yield (
+                        _TOOL_END_PREFIX + orjson.dumps(event["name"])
+                        + _TOOL_END_MID + orjson.dumps(tool_call_id)
+                        + _TOOL_STATUS_SUFFIX
+                    )
+                    
+                    turn_messages.append(tool_message)
+                    
+                    # Buffer for the next bulk save in OpenAI format with the
+                    # LLM's native tool_call ID
+                    pending_saves.append({
+                        "role": "tool",
+                        "content": content,
+                        "tool_call_id": tool_call_id,
+                        "raw_message": {"role": "tool", **tool_output}
+                    })
                 
-                # Save to database
-                await self.backend_client.save_message(
-                    conversation_id=conversation_id,
-                    role="tool",
-                    content=tool_message.content,
-                    tool_call_id=tool_message.tool_call_id,
-                    raw_message=openai_msg
-                )
-
+                # Save assistant messages to DB in OpenAI format
+                elif kind == "on_chat_model_end":
+                    # v2 hands over the complete AIMessage directly
+                    ai_message = data["output"]
+                    
+                    # Replay unstreamed (cached) replies as a single chunk
+                    if event["run_id"] not in streamed_runs and (
+                        ai_message.content or ai_message.tool_calls
+                    ):
+                        yield (
+                            _STREAM_PREFIX + orjson.dumps(ai_message.content or "")
+                            + _STREAM_MID + orjson.dumps(ai_message.tool_calls or [])
+                            + _STREAM_SUFFIX
+                        )
+                    streamed_runs.discard(event["run_id"])
+                    
+                    # Convert to OpenAI format with LLM's native tool_call IDs
+                    openai_msg = {
+                        "role": "assistant",
+                        "content": ai_message.content or "",
+                    }
+                    
+                    # Add tool_calls if present (uses LLM's UUIDs)
+                    if hasattr(ai_message, "tool_calls") and ai_message.tool_calls:
+                        openai_msg["tool_calls"] = [
+                            {
+                                "id": tc["id"],
+                                "type": "function",
+                                "function": {
+                                    "name": tc["name"],
+                                    "arguments": orjson.dumps(tc["args"]).decode()
+                                }
+                            }
+                            for tc in ai_message.tool_calls
+                        ]
+                    
+                    if not ai_message.tool_calls and isinstance(ai_message.content, str):
+                        final_response = ai_message.content
+                    turn_messages.append(
+                        AIMessage(
+                            content=ai_message.content or "",
+                            tool_calls=ai_message.tool_calls or []
+                        )
+                    )
+                    
+                    # Buffer for the next bulk save
+                    pending_saves.append({
+                        "role": "assistant",
+                        "content": openai_msg.get("content"),
+                        "tool_call_id": None,
+                        "raw_message": openai_msg
+                    })
+        finally:
+            # Persist whatever the turn produced, even if the model call
+            # failed or the client disconnected mid-stream
+            self._flush_saves(conversation_id, pending_saves, save_tasks)
+        
+        if query_embedding is not None and final_response:
+            self.response_cache.add(query_embedding, final_response)
+        
+        # Make this turn durable before the stream closes
+        await self._finish_turn(
+            conversation_id, history, turn_messages, pending_saves, save_tasks
+        )
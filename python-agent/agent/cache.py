@@ -0,0 +1,82 @@
+"""In-process caches used by the agent."""
+import logging
+from typing import Optional
+import numpy as np
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
+
+logger = logging.getLogger(__name__)
+
+
+def configure_llm_cache(backend: str, redis_url: str = "", max_size: Optional[int] = None) -> None:
+    """
+    Install LangChain's global exact-match LLM cache.
+    backend is "none", "memory" or "redis". Redis needs the optional
+    langchain-community and redis packages; without them the in-memory
+    cache is used.
+    """
+    if backend == "none":
+        return
+    if backend == "redis":
+        try:
+            from langchain_community.cache import RedisCache
+            from redis import Redis
+            set_llm_cache(RedisCache(redis_=Redis.from_url(redis_url)))
+            logger.info("🗄️ LLM cache: redis")
+            return
+        except ImportError:
+            logger.warning("Redis LLM cache needs langchain-community and redis, using memory")
+    set_llm_cache(InMemoryCache(maxsize=max_size))
+    logger.info("🗄️ LLM cache: memory")
+
+
+class SemanticResponseCache:
+    """
+    Cache of final agent responses keyed by query embedding.
+    A lookup hits when the cosine similarity to a stored query reaches
+    the threshold. Entries live in a fixed-size ring buffer (FIFO eviction).
+    """
+    
+    def __init__(self, threshold: float, max_size: int):
+        self.threshold = threshold
+        self.max_size = max_size
+        self._embeds: Optional[np.ndarray] = None  # max_size x D, unit rows
+        self._responses: list[Optional[str]] = [None] * max_size
+        self._count = 0
+        self._next = 0
+    
+    @staticmethod
+    def _normalize(embedding: list[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+    
+    def lookup(self, embedding: list[float]) -> Optional[str]:
+        """Return the cached response for the most similar query, if close enough."""
+        if self._count == 0:
+            return None
+        query = self._normalize(embedding)
+        if query is None or query.shape[0] != self._embeds.shape[1]:
+            return None
+        sims = self._embeds[:self._count] @ query
+        best = int(sims.argmax())
+        if sims[best] >= self.threshold:
+            return self._responses[best]
+        return None
+    
+    def add(self, embedding: list[float], response: str) -> None:
+        """Store a response, overwriting the oldest entry when full."""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        if self._embeds is None or self._embeds.shape[1] != vector.shape[0]:
+            self._embeds = np.zeros((self.max_size, vector.shape[0]), dtype=np.float32)
+            self._responses = [None] * self.max_size
+            self._count = 0
+            self._next = 0
+        self._embeds[self._next] = vector
+        self._responses[self._next] = response
+        self._next = (self._next + 1) % self.max_size
+        self._count = min(self._count + 1, self.max_size)
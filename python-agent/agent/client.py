@@ -1,22 +1,89 @@
 """Type-safe HTTP client for Go backend APIs."""
 import httpx
+from cachetools import TTLCache
+import logging
+import msgspec
+import orjson
+from pydantic import TypeAdapter
 from typing import Optional
+from typing_extensions import TypedDict
 from uuid import UUID
 from agent.models import (
     Conversation, Message, QAPair,
     SearchQARequest, SearchQAResponse,
     GetQAByIDsRequest, GetQAByIDsResponse,
-    SemanticSearchRequest, SemanticSearchResponse
+    SemanticSearchRequest, SemanticSearchResponse,
+    EmbedTextRequest, EmbedTextResponse,
+    StoredMessage, StoredMessagesResponse
 )
 from agent.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Reusable typed decoder for the history load path
+_stored_messages_decoder = msgspec.json.Decoder(StoredMessagesResponse)
+
+
+# Backend response envelopes. Their adapters are built once and validate
+# raw response bytes directly, without an intermediate dict or **kwargs;
+# keys not listed (e.g. pagination) are ignored.
+
+class _ConversationEnvelope(TypedDict):
+    conversation: Conversation
+
+
+class _MessageEnvelope(TypedDict):
+    message: Message
+
+
+class _MessagesEnvelope(TypedDict):
+    messages: list[Message]
+
+
+class _MessageListEnvelope(TypedDict):
+    data: list[Message]
+
+
+_conversation_adapter = TypeAdapter(_ConversationEnvelope)
+_message_adapter = TypeAdapter(_MessageEnvelope)
+_messages_adapter = TypeAdapter(_MessagesEnvelope)
+_message_list_adapter = TypeAdapter(_MessageListEnvelope)
+
+
+# Request bodies are serialized by pydantic-core / orjson, not stdlib json
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _loads(response: httpx.Response):
+    """Parse a JSON response body with orjson instead of the stdlib decoder."""
+    return orjson.loads(response.content)
+
 
 class BackendClient:
     """Type-safe HTTP client for Go backend APIs."""
     
     def __init__(self, base_url: str = settings.backend_url):
         self.base_url = base_url
-        self.client = httpx.AsyncClient(base_url=base_url, timeout=30.0)
+        # One pooled client per BackendClient, reused for every call so
+        # requests ride kept-alive connections instead of new handshakes.
+        # HTTP/2 is negotiated via ALPN over TLS; a cleartext backend is
+        # only spoken to in HTTP/2 with prior knowledge (h2c).
+        h2c = settings.backend_h2c and base_url.startswith("http://")
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=30.0,
+            http1=not h2c,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.backend_max_connections,
+                max_keepalive_connections=settings.backend_max_keepalive_connections
+            )
+        )
+        # Full-text search results keyed by (normalized query, limit)
+        self._search_cache: TTLCache = TTLCache(
+            maxsize=settings.search_cache_size,
+            ttl=settings.search_cache_ttl
+        )
     
     async def create_conversation(
         self, 
@@ -25,11 +92,11 @@ class BackendClient:
         """Create a new conversation."""
         response = await self.client.post(
             "/api/conversations",
-            json={"title": title} if title else {}
+            content=orjson.dumps({"title": title} if title else {}),
+            headers=_JSON_HEADERS
         )
         response.raise_for_status()
-        data = response.json()
-        return Conversation(**data["conversation"])
+        return _conversation_adapter.validate_json(response.content)["conversation"]
     
     async def get_messages(
         self, 
@@ -40,8 +107,21 @@ class BackendClient:
             f"/api/conversations/{conversation_id}/messages"
         )
         response.raise_for_status()
-        data = response.json()
-        return [Message(**msg) for msg in data["data"]]
+        return _message_list_adapter.validate_json(response.content)["data"]
+    
+    async def get_stored_messages(
+        self,
+        conversation_id: UUID
+    ) -> list[StoredMessage]:
+        """
+        Get messages for a conversation, decoded with msgspec into the
+        structs the agent rebuilds its history from.
+        """
+        response = await self.client.get(
+            f"/api/conversations/{conversation_id}/messages"
+        )
+        response.raise_for_status()
+        return _stored_messages_decoder.decode(response.content).data
     
     async def search_qa(
         self, 
@@ -49,26 +129,53 @@ class BackendClient:
         limit: int = 5
     ) -> SearchQAResponse:
         """Search QA pairs using full-text search."""
+        return SearchQAResponse.model_validate(await self.search_qa_raw(query, limit))
+    
+    async def search_qa_raw(
+        self, 
+        query: str, 
+        limit: int = 5
+    ) -> dict:
+        """
+        Search QA pairs using full-text search, returning the parsed JSON
+        body without model validation (for callers that only format it).
+        Results are cached briefly; Postgres full-text search ignores case
+        and extra whitespace, so queries are normalized before lookup.
+        The cached dict is shared: callers must not mutate it.
+        """
+        query = " ".join(query.lower().split())
+        cached = self._search_cache.get((query, limit))
+        if cached is not None:
+            return cached
+        
         request = SearchQARequest(query=query, limit=limit)
         response = await self.client.post(
             "/tools/search-qa",
-            json=request.model_dump()
+            content=request.model_dump_json(),
+            headers=_JSON_HEADERS
         )
         response.raise_for_status()
-        return SearchQAResponse(**response.json())
+        result = _loads(response)
+        self._search_cache[(query, limit)] = result
+        return result
     
     async def get_qa_by_ids(
         self, 
-        ids: list[UUID]
+        ids: list[str]
     ) -> GetQAByIDsResponse:
-        """Get specific QA pairs by their IDs."""
-        request = GetQAByIDsRequest(ids=ids)
+        """
+        Get specific QA pairs by their IDs.
+        The ID strings are parsed once, by the request model; invalid IDs
+        raise a ValidationError (a ValueError).
+        """
+        request = GetQAByIDsRequest.model_validate({"ids": ids}, strict=False)
         response = await self.client.post(
             "/tools/get-qa-by-ids",
-            json={"ids": [str(id) for id in ids]}
+            content=request.model_dump_json(),
+            headers=_JSON_HEADERS
         )
         response.raise_for_status()
-        return GetQAByIDsResponse(**response.json())
+        return GetQAByIDsResponse.model_validate_json(response.content)
     
     async def save_message(
         self,
@@ -88,11 +195,32 @@ class BackendClient:
         }
         response = await self.client.post(
             "/tools/save-message",
-            json=payload
+            content=orjson.dumps(payload),
+            headers=_JSON_HEADERS
         )
         response.raise_for_status()
-        data = response.json()
-        return Message(**data["message"])
+        return _message_adapter.validate_json(response.content)["message"]
+    
+    async def save_messages_bulk(
+        self,
+        conversation_id: UUID,
+        messages: list[dict]
+    ) -> list[Message]:
+        """
+        Save several messages to the backend in a single request.
+        Each item has role, content, tool_call_id and raw_message keys.
+        """
+        payload = {
+            "conversation_id": str(conversation_id),
+            "messages": messages
+        }
+        response = await self.client.post(
+            "/tools/save-messages",
+            content=orjson.dumps(payload),
+            headers=_JSON_HEADERS
+        )
+        response.raise_for_status()
+        return _messages_adapter.validate_json(response.content)["messages"]
     
     async def semantic_search_qa(
         self, 
@@ -106,12 +234,43 @@ class BackendClient:
         request = SemanticSearchRequest(query=query, top_k=top_k)
         response = await self.client.post(
             "/tools/semantic-search-qa",
-            json=request.model_dump()
+            content=request.model_dump_json(),
+            headers=_JSON_HEADERS
+        )
+        response.raise_for_status()
+        return SemanticSearchResponse.model_validate_json(response.content)
+    
+    async def embed_text(self, text: str) -> list[float]:
+        """
+        Embed text with the same model the backend uses for semantic search.
+        """
+        request = EmbedTextRequest(text=text)
+        response = await self.client.post(
+            "/tools/embed",
+            content=request.model_dump_json(),
+            headers=_JSON_HEADERS
         )
         response.raise_for_status()
-        return SemanticSearchResponse(**response.json())
+        return EmbedTextResponse.model_validate_json(response.content).embedding
+    
+    async def warmup(self) -> None:
+        """
+        Open a pooled connection to the backend ahead of the first request,
+        so the first user message doesn't pay connection setup.
+        """
+        try:
+            response = await self.client.get("/health")
+            response.raise_for_status()
+            logger.info(f"🔌 Backend connection warmed up: {self.base_url}")
+        except Exception as e:
+            logger.warning(f"Backend warm-up failed: {e}")
     
     async def close(self):
         """Close the HTTP client."""
         await self.client.aclose()
 
+
+# Process-wide client shared by the agent, the tools and the API routes,
+# so every backend call draws from one keep-alive connection pool
+backend_client = BackendClient()
+
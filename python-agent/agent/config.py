@@ -1,6 +1,7 @@
 """Configuration management using Pydantic Settings."""
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -17,6 +18,33 @@ class Settings(BaseSettings):
     
     # Go Backend Configuration
     backend_url: str = "http://localhost:8080"
+    backend_max_connections: int = 100  # One pool shared by agent, tools and routes
+    backend_max_keepalive_connections: int = 20
+    backend_h2c: bool = True  # Speak cleartext HTTP/2 to an http:// backend (prior knowledge)
+    search_cache_ttl: int = 60  # Seconds full-text search results are reused
+    search_cache_size: int = 512
+    
+    # Agent Configuration
+    history_cache_size: int = 256  # Conversations kept in the in-process history cache
+    history_cache_ttl: int = 1800  # Seconds an idle conversation stays cached
+    history_window_turns: int = 10  # Most recent user turns sent to the LLM (0 = all)
+    history_summary_enabled: bool = True  # Summarize turns outside the window instead of dropping them
+    summary_model: str = "gemini-2.5-flash-lite"
+    tool_cache_ttl: int = 300  # Seconds identical tool calls reuse a result (0 = off)
+    tool_cache_size: int = 4096
+    confident_match_score: float = 0.85  # Semantic score at which the agent stops searching
+    
+    # Semantic response cache for standalone questions. Needs real embeddings:
+    # the backend's mock embedding client makes every query look identical.
+    semantic_cache_enabled: bool = False
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_size: int = Field(default=1024, ge=1)
+    
+    # Exact-match LLM call cache: "none", "memory" or "redis". Off by default
+    # so development always sees fresh responses.
+    llm_cache: Literal["none", "memory", "redis"] = "none"
+    llm_cache_size: int = 1024  # Entries kept by the in-memory cache
+    redis_url: str = "redis://localhost:6379/0"
     
     # Feature Flags
     use_pinecone: bool = False
@@ -1,5 +1,7 @@
 """Pydantic models matching Go backend OpenAI message format."""
-from pydantic import BaseModel, Field, ConfigDict
+import msgspec
+from functools import cached_property
+from pydantic import BaseModel, Field, ConfigDict, computed_field
 from typing import Optional, Any, Literal
 from uuid import UUID
 from datetime import datetime
@@ -57,6 +59,12 @@ class QAPair(BaseModel):
     answer: str
     created_at: datetime
     updated_at: datetime
+    
+    @computed_field
+    @cached_property
+    def id_str(self) -> str:
+        """Canonical string form of the ID, formatted once per instance."""
+        return str(self.id)
 
 
 class SearchQARequest(BaseModel):
@@ -69,7 +77,8 @@ class SearchQARequest(BaseModel):
 
 class SearchQAResponse(BaseModel):
     """Search QA response."""
-    model_config = ConfigDict(strict=True)
+    # Trusted backend output: lax validation, like the models it wraps
+    model_config = ConfigDict(strict=False)
     
     qa_pairs: list[QAPair]
     count: int
@@ -84,7 +93,8 @@ class GetQAByIDsRequest(BaseModel):
 
 class GetQAByIDsResponse(BaseModel):
     """Get QA by IDs response."""
-    model_config = ConfigDict(strict=True)
+    # Trusted backend output: lax validation, like the models it wraps
+    model_config = ConfigDict(strict=False)
     
     qa_pairs: list[QAPair]
 
@@ -107,8 +117,57 @@ class SemanticSearchRequest(BaseModel):
 
 class SemanticSearchResponse(BaseModel):
     """Semantic search response with scores."""
-    model_config = ConfigDict(strict=True)
+    # Trusted backend output: lax validation, like the models it wraps
+    model_config = ConfigDict(strict=False)
     
     results: list[SimilarityMatch]
     count: int
 
+
+class EmbedTextRequest(BaseModel):
+    """Embed text request."""
+    model_config = ConfigDict(strict=True)
+    
+    text: str = Field(..., min_length=1, max_length=2000)
+
+
+class EmbedTextResponse(BaseModel):
+    """Embedding produced by the backend's search embedding model."""
+    model_config = ConfigDict(strict=False)
+    
+    embedding: list[float]
+
+
+# msgspec structs for the history load path. They decode the messages
+# endpoint straight into the fields the agent reads; unknown fields are
+# ignored, so no intermediate dicts are built.
+
+class StoredFunctionCall(msgspec.Struct):
+    """Stored OpenAI function call."""
+    name: str
+    arguments: str = "{}"  # JSON string
+
+
+class StoredToolCall(msgspec.Struct):
+    """Stored OpenAI tool call."""
+    id: str
+    function: StoredFunctionCall
+
+
+class StoredRawMessage(msgspec.Struct):
+    """Stored OpenAI-format message (the raw_message JSONB column)."""
+    content: Optional[str] = None
+    tool_calls: Optional[list[StoredToolCall]] = None
+    tool_call_id: Optional[str] = None
+    name: Optional[str] = None
+
+
+class StoredMessage(msgspec.Struct):
+    """Message row as needed to rebuild agent history."""
+    role: str
+    raw_message: StoredRawMessage
+
+
+class StoredMessagesResponse(msgspec.Struct):
+    """Response of the conversation messages endpoint."""
+    data: list[StoredMessage]
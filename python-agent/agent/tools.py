@@ -1,14 +1,173 @@
 """LangChain tools for the AI agent to interact with Go backend."""
 from langchain_core.tools import tool
-from agent.client import BackendClient
+from cachetools import TTLCache
+from agent.client import backend_client
+from agent.config import settings
 from typing import Annotated
-from uuid import UUID
+import asyncio
+import functools
+import inspect
+import io
+import logging
+import orjson
 
-# Shared backend client instance
-backend_client = BackendClient()
+logger = logging.getLogger(__name__)
+
+# Appended to semantic search results whose top score is high enough to answer from
+HIGH_CONFIDENCE_MARKER = "HIGH-CONFIDENCE MATCH"
+
+# Tool outputs that report a failure; these are never cached
+_ERROR_PREFIXES = ("Error", "Invalid")
+
+
+class _Uncacheable(str):
+    """Tool output returned as-is but never cached, e.g. a partial result."""
+
+# (tool name, canonical JSON args) -> tool output, shared across turns
+_tool_cache: TTLCache = TTLCache(
+    maxsize=settings.tool_cache_size,
+    ttl=max(settings.tool_cache_ttl, 1)
+)
+# Calls currently running, awaited by identical concurrent calls
+_in_flight: dict[tuple, asyncio.Future] = {}
+
+
+def _cached_tool(func):
+    """
+    Cache a tool's output by its canonical arguments and coalesce concurrent
+    identical calls into a single backend request (single-flight).
+    """
+    if settings.tool_cache_ttl <= 0:
+        return func
+    signature = inspect.signature(func)
+    
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__, orjson.dumps(bound.arguments, option=orjson.OPT_SORT_KEYS))
+        
+        cached = _tool_cache.get(key)
+        if cached is not None:
+            logger.info(f"♻️ Tool cache hit: {func.__name__}")
+            return cached
+        while (in_flight := _in_flight.get(key)) is not None:
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The leading call was cancelled; run the tool here instead
+        
+        future = asyncio.get_running_loop().create_future()
+        _in_flight[key] = future
+        try:
+            result = await func(*args, **kwargs)
+            if isinstance(result, _Uncacheable):
+                result = str(result)
+            elif not result.startswith(_ERROR_PREFIXES):
+                _tool_cache[key] = result
+            future.set_result(result)
+            return result
+        finally:
+            _in_flight.pop(key, None)
+            if not future.done():
+                future.cancel()
+    
+    return wrapper
+
+
+def _confidence_note(response) -> str:
+    """
+    Note appended when the top semantic score is high enough to answer from.
+    Stops retrieval early: the model can answer instead of spending another
+    LLM round-trip on search.
+    """
+    if not response.results:
+        return ""
+    top_score = max(match.score for match in response.results)
+    if top_score < settings.confident_match_score:
+        return ""
+    return (
+        f"\n\n{HIGH_CONFIDENCE_MARKER} (top similarity {top_score * 100:.1f}%): "
+        "these results are sufficient. Answer now without further searches."
+    )
+
+
+def _write_qa(buf: io.StringIO, question: str, answer: str, qa_id: str) -> None:
+    """Write a Q&A pair's question, answer and ID (the tail of a result entry)."""
+    buf.write(question)
+    buf.write("\nAnswer: ")
+    buf.write(answer)
+    buf.write("\nID: ")
+    buf.write(qa_id)
 
 
 @tool
+@_cached_tool
+async def search_both(
+    query: Annotated[str, "The user's question or search query"],
+    limit: Annotated[int, "Number of results per search method (1-10)"] = 5
+) -> str:
+    """
+    ⚡ COMBINED SEARCH: Run semantic AND keyword search in parallel and return the merged results.
+    
+    ✅ Call this ONCE for every question - it covers both search methods in a single step.
+    Semantic matches come first with similarity scores, followed by keyword-only matches.
+    Duplicates found by both methods are listed once.
+    
+    Returns: Matching Q&A pairs with their IDs. Flags a HIGH-CONFIDENCE MATCH when the
+    top semantic result is close enough to answer from directly.
+    """
+    limit = min(limit, 10)
+    semantic, keyword = await asyncio.gather(
+        backend_client.semantic_search_qa(query, limit),
+        backend_client.search_qa_raw(query, limit),
+        return_exceptions=True
+    )
+    if isinstance(semantic, Exception) and isinstance(keyword, Exception):
+        return f"Error searching knowledge base: {str(semantic)}"
+    
+    buf = io.StringIO()
+    count = 0
+    seen_ids = set()
+    if isinstance(semantic, Exception):
+        logger.error(f"❌ Semantic search failed, using keyword results only: {semantic}")
+    else:
+        for match in semantic.results:
+            seen_ids.add(match.qa_pair.id_str)
+            count += 1
+            if count > 1:
+                buf.write("\n\n")
+            buf.write(f"Result {count} (Similarity: {match.score * 100:.1f}%):\nQuestion: ")
+            _write_qa(buf, match.qa_pair.question, match.qa_pair.answer, match.qa_pair.id_str)
+    if isinstance(keyword, Exception):
+        logger.error(f"❌ Keyword search failed, using semantic results only: {keyword}")
+    else:
+        for qa in keyword["qa_pairs"]:
+            if qa["id"] in seen_ids:
+                continue
+            seen_ids.add(qa["id"])
+            count += 1
+            if count > 1:
+                buf.write("\n\n")
+            buf.write(f"Result {count} (Keyword match):\nQuestion: ")
+            _write_qa(buf, qa["question"], qa["answer"], qa["id"])
+    
+    if not count:
+        output = "No relevant information found in the knowledge base."
+    else:
+        if not isinstance(semantic, Exception):
+            buf.write(_confidence_note(semantic))
+        output = buf.getvalue()
+    if isinstance(semantic, Exception) or isinstance(keyword, Exception):
+        # Don't let a transient failure pin half the results in the cache
+        return _Uncacheable(output)
+    return output
+
+
+@tool
+@_cached_tool
 async def search_knowledge_base(
     query: Annotated[str, "The search query to find relevant Q&A pairs. Be specific with keywords."],
     limit: Annotated[int, "Number of results to return (1-10)"] = 5
@@ -16,8 +175,8 @@ async def search_knowledge_base(
     """
     🔍 KEYWORD SEARCH: Search the company knowledge base using full-text keyword matching.
     
-    ⚠️ ALWAYS use this TOGETHER WITH semantic_search_knowledge_base for every question!
-    Do NOT use this as a fallback - use BOTH search methods EVERY TIME.
+    ⚠️ Prefer search_both, which runs this together with semantic search in one step.
+    Use this alone to retry with different keywords.
     
     Good for exact keyword matches and specific technical terms that semantic search might miss.
     This searches through all available Q&A pairs and returns the most relevant matches.
@@ -26,26 +185,25 @@ async def search_knowledge_base(
     Returns: Matching question-answer pairs from the knowledge base with their IDs.
     """
     try:
-        response = await backend_client.search_qa(query, min(limit, 10))
+        data = await backend_client.search_qa_raw(query, min(limit, 10))
         
-        if response.count == 0:
+        if data["count"] == 0:
             return "No relevant information found in the knowledge base."
         
-        results = []
-        for i, qa in enumerate(response.qa_pairs, 1):
-            results.append(
-                f"Result {i}:\n"
-                f"Question: {qa.question}\n"
-                f"Answer: {qa.answer}\n"
-                f"ID: {qa.id}"
-            )
+        buf = io.StringIO()
+        for i, qa in enumerate(data["qa_pairs"], 1):
+            if i > 1:
+                buf.write("\n\n")
+            buf.write(f"Result {i}:\nQuestion: ")
+            _write_qa(buf, qa["question"], qa["answer"], qa["id"])
         
-        return "\n\n".join(results)
+        return buf.getvalue()
     except Exception as e:
         return f"Error searching knowledge base: {str(e)}"
 
 
 @tool
+@_cached_tool
 async def get_qa_by_ids(
     qa_ids: Annotated[list[str], "List of QA pair UUIDs to retrieve"]
 ) -> str:
@@ -56,24 +214,24 @@ async def get_qa_by_ids(
     Each ID should be a valid UUID string.
     """
     try:
-        # Convert string IDs to UUID objects
-        uuids = [UUID(qa_id) for qa_id in qa_ids]
-        
-        # Call backend endpoint
-        response = await backend_client.get_qa_by_ids(uuids)
+        # Call backend endpoint; the request model validates the IDs
+        response = await backend_client.get_qa_by_ids(qa_ids)
         
         if not response.qa_pairs:
             return "No Q&A pairs found for the provided IDs."
         
-        results = []
-        for qa in response.qa_pairs:
-            results.append(
-                f"ID: {qa.id}\n"
-                f"Question: {qa.question}\n"
-                f"Answer: {qa.answer}"
-            )
+        buf = io.StringIO()
+        for i, qa in enumerate(response.qa_pairs):
+            if i:
+                buf.write("\n\n")
+            buf.write("ID: ")
+            buf.write(qa.id_str)
+            buf.write("\nQuestion: ")
+            buf.write(qa.question)
+            buf.write("\nAnswer: ")
+            buf.write(qa.answer)
         
-        return "\n\n".join(results)
+        return buf.getvalue()
     except ValueError as e:
         return f"Invalid UUID format: {str(e)}"
     except Exception as e:
@@ -81,6 +239,7 @@ async def get_qa_by_ids(
 
 
 @tool
+@_cached_tool
 async def semantic_search_knowledge_base(
     query: Annotated[str, "The semantic search query"],
     top_k: Annotated[int, "Number of semantically similar results (1-20)"] = 5
@@ -88,17 +247,15 @@ async def semantic_search_knowledge_base(
     """
     🎯 SEMANTIC SEARCH: Search the knowledge base using AI-powered semantic similarity (Pinecone vector search).
     
-    ⚠️ ALWAYS use this TOGETHER WITH search_knowledge_base for every question!
-    Do NOT rely on this alone - use BOTH search methods EVERY TIME.
+    ⚠️ Prefer search_both, which runs this together with keyword search in one step.
+    Use this alone to retry with a rephrased query.
     
     Use this for finding conceptually related content, even if keywords don't match exactly.
     This is powerful for understanding meaning and context, but may miss exact keyword matches.
     
     Returns: Matching Q&A pairs with similarity scores (0.0-1.0, higher is more similar).
+    Flags a HIGH-CONFIDENCE MATCH when the top result is close enough to answer from directly.
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
     try:
         logger.info(f"🔍 Semantic search called with query='{query}', top_k={top_k}")
         logger.info(f"📡 Calling backend at: {backend_client.base_url}/tools/semantic-search-qa")
@@ -111,26 +268,26 @@ async def semantic_search_knowledge_base(
             logger.warning(f"⚠️ No semantic search results found for query: '{query}'")
             return "No semantically similar information found in the knowledge base."
         
-        results = []
+        buf = io.StringIO()
         for i, match in enumerate(response.results, 1):
             # Format with score as percentage for clarity
             similarity_pct = match.score * 100
             logger.debug(f"  Result {i}: score={similarity_pct:.1f}%, question='{match.qa_pair.question[:50]}...'")
-            results.append(
-                f"Result {i} (Similarity: {similarity_pct:.1f}%):\n"
-                f"Question: {match.qa_pair.question}\n"
-                f"Answer: {match.qa_pair.answer}\n"
-                f"ID: {match.qa_pair.id}"
-            )
-        
-        logger.info(f"✅ Returning {len(results)} semantic search results")
-        return "\n\n".join(results)
+            if i > 1:
+                buf.write("\n\n")
+            buf.write(f"Result {i} (Similarity: {similarity_pct:.1f}%):\nQuestion: ")
+            _write_qa(buf, match.qa_pair.question, match.qa_pair.answer, match.qa_pair.id_str)
+        
+        logger.info(f"✅ Returning {len(response.results)} semantic search results")
+        buf.write(_confidence_note(response))
+        return buf.getvalue()
     except Exception as e:
         logger.error(f"❌ Semantic search error: {str(e)}", exc_info=True)
         return f"Error in semantic search: {str(e)}"
 
 
 @tool
+@_cached_tool
 async def list_knowledge_base_topics() -> str:
     """
     📋 List all available Q&A pairs in the knowledge base to see what topics are covered.
@@ -144,17 +301,21 @@ async def list_knowledge_base_topics() -> str:
     """
     try:
         # Get all QA pairs with a high limit
-        response = await backend_client.search_qa("", limit=100)
+        data = await backend_client.search_qa_raw("", limit=100)
         
-        if response.count == 0:
+        if data["count"] == 0:
             return "The knowledge base is currently empty. No Q&A pairs have been added yet."
         
-        topics = []
-        for i, qa in enumerate(response.qa_pairs, 1):
-            topics.append(f"{i}. {qa.question} (ID: {qa.id})")
+        buf = io.StringIO()
+        buf.write(f"📚 Knowledge Base Contents ({data['count']} Q&A pairs):\n")
+        for i, qa in enumerate(data["qa_pairs"], 1):
+            buf.write(f"\n{i}. ")
+            buf.write(qa["question"])
+            buf.write(" (ID: ")
+            buf.write(qa["id"])
+            buf.write(")")
         
-        header = f"📚 Knowledge Base Contents ({response.count} Q&A pairs):\n\n"
-        return header + "\n".join(topics)
+        return buf.getvalue()
     except Exception as e:
         return f"Error listing topics: {str(e)}"
 
@@ -162,8 +323,9 @@ async def list_knowledge_base_topics() -> str:
 # Complete tool list - Agent will choose which tools to use based on context
 # ORDER MATTERS: Most important tools first
 tools = [
-    semantic_search_knowledge_base, # Primary tool - AI-powered semantic search (use this first!)
-    search_knowledge_base,          # Fallback - keyword-based search
+    search_both,                    # Primary tool - semantic + keyword search in one step
+    semantic_search_knowledge_base, # Retry with a rephrased semantic query
+    search_knowledge_base,          # Retry with different keywords
     list_knowledge_base_topics,     # Helper to see what's available
     get_qa_by_ids,                  # For retrieving specific items
 ]
@@ -1,7 +1,10 @@
 """FastAPI routes for chat endpoints."""
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import Optional
 from uuid import UUID
+import logging
+import orjson
 from api.schemas import (
     ChatRequest, ChatResponse, 
     CreateConversationRequest, ConversationResponse
@@ -9,42 +12,64 @@ from api.schemas import (
 from agent.agent import ConversationalAgent
 from agent.client import BackendClient
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/chat", tags=["chat"])
-agent = ConversationalAgent()
-backend_client = BackendClient()
+# Message lists change only when a turn is saved; let clients revalidate
+# cheaply instead of re-downloading them
+_MESSAGES_CACHE_CONTROL = "private, max-age=2, must-revalidate"
+
+
+def get_agent(request: Request) -> ConversationalAgent:
+    """Dependency returning the shared conversational agent (built in lifespan)."""
+    return request.app.state.agent
 
 
-@router.post("/conversations", response_model=ConversationResponse)
-async def create_conversation(request: CreateConversationRequest):
+def get_backend(request: Request) -> BackendClient:
+    """Dependency returning the shared backend client (set in lifespan)."""
+    return request.app.state.backend
+
+
+@router.post(
+    "/conversations",
+    # Documents the body in OpenAPI without a runtime response_model pass
+    responses={200: {"model": ConversationResponse}}
+)
+async def create_conversation(
+    request: CreateConversationRequest,
+    backend: BackendClient = Depends(get_backend)
+):
     """Create a new conversation."""
     try:
-        conv = await backend_client.create_conversation(request.title)
-        return ConversationResponse(conversation=conv)
+        conv = await backend.create_conversation(request.title)
+        # Serialized directly: skips response validation and jsonable_encoder
+        return Response(
+            orjson.dumps({"conversation": conv.model_dump(mode="json")}),
+            media_type="application/json"
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/conversations/{conversation_id}/messages")
-async def send_message(conversation_id: UUID, request: ChatRequest):
+async def send_message(
+    conversation_id: UUID,
+    request: ChatRequest,
+    agent: ConversationalAgent = Depends(get_agent)
+):
     """Send a message and stream the agent's response as JSON events."""
-    import json
-    import logging
-    
-    logger = logging.getLogger(__name__)
-    
     try:
         async def generate():
             try:
                 async for event in agent.chat(conversation_id, request.message):
-                    # Stream as newline-delimited JSON
-                    yield f"{event}\n"
+                    # Stream as newline-delimited JSON (already encoded bytes)
+                    yield event + b"\n"
             except Exception as e:
                 logger.error(f"Error in chat stream: {e}")
-                error_event = json.dumps({
+                yield orjson.dumps({
                     "type": "error",
                     "data": {"message": str(e)}
-                })
-                yield f"{error_event}\n"
+                }) + b"\n"
         
         return StreamingResponse(generate(), media_type="application/x-ndjson")
     except Exception as e:
@@ -52,10 +77,30 @@ async def send_message(conversation_id: UUID, request: ChatRequest):
 
 
 @router.get("/conversations/{conversation_id}/messages")
-async def get_messages(conversation_id: UUID):
-    """Get conversation messages."""
+async def get_messages(
+    conversation_id: UUID,
+    if_none_match: Optional[str] = Header(None),
+    backend: BackendClient = Depends(get_backend)
+):
+    """
+    Get conversation messages.
+    Supports conditional requests: messages are append-only, so the count
+    and the last message ID identify the list.
+    """
     try:
-        messages = await backend_client.get_messages(conversation_id)
-        return {"messages": messages}
+        messages = await backend.get_messages(conversation_id)
+        last_id = messages[-1].id if messages else "none"
+        etag = f'W/"{len(messages)}-{last_id}"'
+        headers = {"ETag": etag, "Cache-Control": _MESSAGES_CACHE_CONTROL}
+        if if_none_match and (
+            if_none_match.strip() == "*"
+            or etag in (tag.strip() for tag in if_none_match.split(","))
+        ):
+            return Response(status_code=304, headers=headers)
+        return Response(
+            orjson.dumps({"messages": [m.model_dump(mode="json") for m in messages]}),
+            media_type="application/json",
+            headers=headers
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,8 +1,13 @@
 """FastAPI application entry point for LangChain AI Agent."""
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from agent.config import settings
+from agent.agent import ConversationalAgent
+from agent.client import backend_client
 from api.routes import router as chat_router
+from api.orjson_response import ORJSONResponse
+import asyncio
 import uvicorn
 import logging
 
@@ -14,11 +19,48 @@ logging.basicConfig(
 )
 logging.getLogger('agent.agent').setLevel(logging.INFO)
 logging.getLogger('agent.tools').setLevel(logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upper bound for the startup warm-up; the Gemini client has no timeout
+WARMUP_TIMEOUT_SECONDS = 10.0
+
+
+async def warm_up(app: FastAPI) -> None:
+    """Open the backend and Gemini connections ahead of the first chat turn."""
+    try:
+        async with asyncio.timeout(WARMUP_TIMEOUT_SECONDS):
+            await asyncio.gather(app.state.backend.warmup(), app.state.agent.warmup())
+    except TimeoutError:
+        logger.warning(f"Warm-up did not finish within {WARMUP_TIMEOUT_SECONDS:g}s, skipping it")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the shared agent once per worker process and expose it, with the
+    backend client, on app.state for the route dependencies.
+    Startup warms up the backend and Gemini connections in the background,
+    so a slow or unreachable service never blocks the worker from serving;
+    shutdown flushes queued message saves, then closes the backend
+    connections.
+    """
+    app.state.backend = backend_client
+    app.state.agent = ConversationalAgent.get_default()
+    # Referenced until shutdown so the task isn't garbage collected
+    warmup_task = asyncio.create_task(warm_up(app))
+    yield
+    warmup_task.cancel()
+    await asyncio.gather(warmup_task, return_exceptions=True)
+    await app.state.agent.aclose()
+    await backend_client.close()
+
 
 app = FastAPI(
     title="LangChain AI Agent",
     description="Conversational AI agent using Gemini 2.5 Pro",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS configuration for React frontend
@@ -45,5 +87,6 @@ if __name__ == "__main__":
         "main:app",
         host=settings.api_host,
         port=settings.api_port,
+        loop="auto",  # uvloop when installed, stock asyncio otherwise
         reload=True
     )
@@ -0,0 +1,4 @@
+import os
+
+# Settings are read at import time; the tests never reach Gemini
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
@@ -0,0 +1,70 @@
+"""Tests for streaming replies served from the LangChain LLM cache."""
+from uuid import uuid4
+
+import orjson
+import pytest
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.prebuilt import create_react_agent
+
+from agent.agent import ConversationalAgent
+from agent.tools import tools
+
+
+class FakeChatModel(GenericFakeChatModel):
+    """Streams its scripted replies word by word; tools are ignored.
+
+    Each reply is served once, so a second identical call must hit the cache.
+    """
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def streamed_content(events: list[bytes]) -> str:
+    """Concatenate the content of the on_chat_model_stream events."""
+    content = ""
+    for raw in events:
+        event = orjson.loads(raw)["data"]
+        if event["event"] == "on_chat_model_stream":
+            content += event["data"]["chunk"]["content"]
+    return content
+
+
+@pytest.fixture
+def llm_cache():
+    set_llm_cache(InMemoryCache())
+    yield
+    set_llm_cache(None)
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    agent = ConversationalAgent()
+    agent.response_cache = None
+    
+    async def get_stored_messages(conversation_id):
+        return []
+    
+    async def save_messages_bulk(conversation_id, messages):
+        return []
+    
+    monkeypatch.setattr(agent.backend_client, "get_stored_messages", get_stored_messages)
+    monkeypatch.setattr(agent.backend_client, "save_messages_bulk", save_messages_bulk)
+    agent.llm = FakeChatModel(
+        messages=iter([AIMessage(content="Docker is a container tool.")])
+    )
+    agent.agent = create_react_agent(agent.llm, tools)
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_cached_reply_is_streamed(agent, llm_cache):
+    """A cache hit emits no stream chunks; the reply must still reach the client."""
+    first = [event async for event in agent.chat(uuid4(), "What is Docker?")]
+    second = [event async for event in agent.chat(uuid4(), "What is Docker?")]
+    
+    assert streamed_content(first) == "Docker is a container tool."
+    assert streamed_content(second) == "Docker is a container tool."